@@ -8,9 +8,12 @@ Tests:
   - Winter extreme: 2026-12-21
   - Summer extreme: 2026-06-21
 
+Requires: numpy.
+
 Exit code: 0 if no FAILs, 1 otherwise.
 """
 
+import argparse
 import subprocess
 import json
 import time
@@ -18,10 +21,35 @@ import hashlib
 import random
 import sys
 import math
+import os
+import functools
+import itertools
+import threading
+import socket
+import tempfile
+import atexit
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json accepts bytes too
+    _loads = json.loads
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
 # ──────────────────────────────────────────────────────────────
 # Configuration
 # ──────────────────────────────────────────────────────────────
@@ -32,6 +60,44 @@ SEED_STRING = TODAY_MACHINE + "polaris"
 
 EXTREME_DATES = ["2026-06-21", "2026-12-21"]
 
+# One SHA256-seeded parent stream; strict-check sampling and fuzz
+# coordinates each get an independent child so neither shifts the other.
+GLOBAL_RNG = np.random.default_rng(int(hashlib.sha256(SEED_STRING.encode()).hexdigest()[:16], 16))
+STRICT_RNG, FUZZ_RNG = GLOBAL_RNG.spawn(2)
+
+# Polaris invocations are independent and spend their time blocked in
+# subprocess I/O, so a thread pool overlaps them without GIL contention.
+MAX_WORKERS = 8
+
+# Pin each pool worker thread to its own allowed CPU (Linux only). Children
+# inherit the spawning thread's affinity, so every polaris process a worker
+# launches stays on one core. Only per-job children should inherit that; the
+# long-lived daemon is started from the main thread. Disabled with --no-pin.
+PIN_WORKERS = True
+_worker_ids = itertools.count()
+
+# Set by main() when the engine supports `polaris batch`, which computes a
+# whole sweep in one process instead of paying startup cost per city.
+USE_BATCH = False
+
+# Set by main() when the engine supports `polaris batch --socket`. main()
+# starts the daemon up front, and it serves every query (sweeps, strict
+# checks, fuzz) over one connection per worker thread.
+USE_DAEMON = False
+DAEMON_SOCKET = Path(tempfile.gettempdir()) / f"polaris-{os.getpid()}.sock"
+_daemon_lock = threading.Lock()
+_daemon_local = threading.local()
+_daemon_ok = None
+
+# Polaris output is deterministic for a fixed (city, date, strategy) on a
+# given engine build, so results are memoized on disk across runs.
+RESULT_CACHE_DIR = Path.home() / ".cache" / "polaris_chronos"
+
+# Filled in by main() with the SHA256 of the polaris binary; part of every
+# cache key, so any rebuild invalidates stale results (the crate version
+# does not change between builds). None disables the result cache.
+ENGINE_ID = None
+
 # ──────────────────────────────────────────────────────────────
 # City Pool (~180 cities, tagged by region + hemisphere/latitude)
 # Format: (name, region, approx_lat)
@@ -192,6 +258,22 @@ CITY_POOL = [
 
 REGIONS = ["Americas", "Europe", "Africa", "MiddleEast", "Asia", "Oceania"]
 
+
+def partition_pool(pool):
+    """Column view of a city pool: (lats, by_region, south_mask, north_mask).
+
+    by_region holds a tuple of pool indices per entry of REGIONS; the masks
+    mark southern-hemisphere and above-55° cities.
+    """
+    region_idx = np.array([REGIONS.index(c[1]) for c in pool], dtype=np.int8)
+    lats = np.array([c[2] for c in pool], dtype=np.float32)
+    by_region = tuple(tuple(np.flatnonzero(region_idx == r).tolist()) for r in range(len(REGIONS)))
+    return lats, by_region, lats < 0, lats > 55
+
+
+# CITY_POOL never changes, so partition it once at import.
+CITY_POOL_PARTS = partition_pool(CITY_POOL)
+
 # ──────────────────────────────────────────────────────────────
 # Deterministic diverse selection
 # ──────────────────────────────────────────────────────────────
@@ -203,75 +285,164 @@ def select_cities(pool, n=30, seed_str=SEED_STRING):
     min_southern = 6
     min_above_55 = 6
 
-    by_region = {r: [] for r in REGIONS}
-    for city in pool:
-        by_region[city[1]].append(city)
+    # Work on pool indices against column arrays; `rng` only ever sees
+    # index lists of the same lengths as before, so picks are unchanged.
+    lats, by_region, south_mask, north_mask = (
+        CITY_POOL_PARTS if pool is CITY_POOL else partition_pool(pool)
+    )
 
     for attempt in range(200):
         selected = []
-        used = set()
-        for region in REGIONS:
-            candidates = by_region[region]
+        used = np.zeros(len(pool), dtype=bool)
+        for candidates in by_region:
             picks = rng.sample(candidates, min(min_per_region, len(candidates)))
             for c in picks:
-                if c[0] not in used:
+                if not used[c]:
                     selected.append(c)
-                    used.add(c[0])
-        remaining_pool = [c for c in pool if c[0] not in used]
+                    used[c] = True
+        remaining_pool = np.flatnonzero(~used).tolist()
         rng.shuffle(remaining_pool)
-        for c in remaining_pool:
-            if len(selected) >= n:
-                break
+        for c in remaining_pool[:max(n - len(selected), 0)]:
             selected.append(c)
-            used.add(c[0])
+            used[c] = True
 
-        southern = sum(1 for c in selected if c[2] < 0)
-        above_55 = sum(1 for c in selected if c[2] > 55)
+        sel_lats = lats[selected]
+        southern = int((sel_lats < 0).sum())
+        above_55 = int((sel_lats > 55).sum())
         if southern >= min_southern and above_55 >= min_above_55:
-            return selected[:n]
+            return [pool[i] for i in selected[:n]]
 
-        # Adjust
+        # Adjust — `replaceable` holds positions in `selected`, so a swap
+        # is a direct assignment instead of a list.index() scan.
         if southern < min_southern:
-            south_pool = [c for c in pool if c[2] < 0 and c[0] not in used]
+            south_pool = np.flatnonzero(south_mask & ~used).tolist()
             rng.shuffle(south_pool)
-            replaceable = [c for c in selected if c[2] > 0 and c[2] < 55]
+            replaceable = np.flatnonzero((sel_lats > 0) & (sel_lats < 55)).tolist()
             for s in south_pool:
                 if southern >= min_southern or not replaceable:
                     break
-                old = replaceable.pop()
-                idx = selected.index(old)
-                selected[idx] = s
-                used.discard(old[0])
-                used.add(s[0])
+                pos = replaceable.pop()
+                used[selected[pos]] = False
+                used[s] = True
+                selected[pos] = s
                 southern += 1
 
         if above_55 < min_above_55:
-            north_pool = [c for c in pool if c[2] > 55 and c[0] not in used]
+            sel_lats = lats[selected]
+            north_pool = np.flatnonzero(north_mask & ~used).tolist()
             rng.shuffle(north_pool)
-            replaceable = [c for c in selected if 0 < c[2] < 55]
+            replaceable = np.flatnonzero((sel_lats > 0) & (sel_lats < 55)).tolist()
             for n_city in north_pool:
                 if above_55 >= min_above_55 or not replaceable:
                     break
-                old = replaceable.pop()
-                idx = selected.index(old)
-                selected[idx] = n_city
-                used.discard(old[0])
-                used.add(n_city[0])
+                pos = replaceable.pop()
+                used[selected[pos]] = False
+                used[n_city] = True
+                selected[pos] = n_city
                 above_55 += 1
 
-        southern = sum(1 for c in selected if c[2] < 0)
-        above_55 = sum(1 for c in selected if c[2] > 55)
+        sel_lats = lats[selected]
+        southern = int((sel_lats < 0).sum())
+        above_55 = int((sel_lats > 55).sum())
         if southern >= min_southern and above_55 >= min_above_55:
-            return selected[:n]
+            return [pool[i] for i in selected[:n]]
 
-    return selected[:n]
+    return [pool[i] for i in selected[:n]]
 
 
 # ──────────────────────────────────────────────────────────────
 # Polaris runner
 # ──────────────────────────────────────────────────────────────
 
+_PRINT_LOCK = threading.Lock()
+
+
+def log(line):
+    """Write one report line with a single locked write.
+
+    Keeps rows whole when workers report concurrently; callers flush
+    once per section instead of per line.
+    """
+    with _PRINT_LOCK:
+        sys.stdout.write(line + "\n")
+
+
+def engine_fingerprint():
+    """SHA256 of the polaris binary, or None if it cannot be read."""
+    h = hashlib.sha256()
+    try:
+        with open(POLARIS_BIN, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _cache_path(city_name, date, strategy):
+    key = hashlib.sha256(f"{city_name}|{date}|{strategy}|{ENGINE_ID}".encode()).hexdigest()
+    return RESULT_CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def cache_load(city_name, date, strategy):
+    """Return a cached result dict, or None on a miss."""
+    if ENGINE_ID is None:
+        return None
+    try:
+        with open(_cache_path(city_name, date, strategy), "rb") as f:
+            return _loads(f.read())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def cache_store(city_name, date, strategy, data):
+    if ENGINE_ID is None:
+        return
+    path = _cache_path(city_name, date, strategy)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def cached_result(fn):
+    """Memoize successful run_polaris results as JSON files on disk.
+
+    Calls without an explicit date are not cached, since "today" moves;
+    nothing is cached when the engine binary could not be fingerprinted.
+    """
+    @functools.wraps(fn)
+    def wrapper(city_name, date=None, strategy="projected45", show_confidence=True):
+        if not date or ENGINE_ID is None:
+            return fn(city_name, date=date, strategy=strategy, show_confidence=show_confidence)
+
+        cached = cache_load(city_name, date, strategy)
+        if cached is not None:
+            return cached, 0.0, None
+
+        data, elapsed, err = fn(city_name, date=date, strategy=strategy, show_confidence=show_confidence)
+        if err is None and data is not None:
+            cache_store(city_name, date, strategy, data)
+        return data, elapsed, err
+
+    return wrapper
+
+
+_JSON_START = re.compile(rb"^[ \t]*\{", re.MULTILINE)
+
+
+@cached_result
 def run_polaris(city_name, date=None, strategy="projected45", show_confidence=True):
+    if daemon_available():
+        job = {"city": city_name, "strategy": strategy}
+        if date:
+            job["date"] = date
+        return query_daemon(job, timeout=30)
+
     cmd = [str(POLARIS_BIN), city_name, "--strategy", strategy]
     if date:
         cmd += ["--date", date]
@@ -279,40 +450,265 @@ def run_polaris(city_name, date=None, strategy="projected45", show_confidence=Tr
         cmd.append("--show-confidence")
 
     t0 = time.monotonic()
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    result = subprocess.run(cmd, capture_output=True, timeout=30)
     elapsed = time.monotonic() - t0
 
     if result.returncode != 0:
-        return None, elapsed, result.stderr.strip()
+        return None, elapsed, result.stderr.decode("utf-8", "replace").strip()
 
-    stdout = result.stdout.strip()
-    if not stdout:
+    # Parse the raw bytes directly; json accepts bytes, so there is no
+    # decode/strip copy on the happy path (isspace() scans without copying).
+    stdout = result.stdout
+    if not stdout or stdout.isspace():
         return None, elapsed, "Empty stdout"
 
     try:
-        data = json.loads(stdout)
+        data = _loads(stdout)
         return data, elapsed, None
     except json.JSONDecodeError:
-        lines = stdout.split("\n")
-        json_start = None
-        for i, line in enumerate(lines):
-            if line.strip().startswith("{"):
-                json_start = i
-                break
-        if json_start is not None:
-            json_text = "\n".join(lines[json_start:])
+        # Noisy prefix: skip ahead to the first line that opens an object.
+        match = _JSON_START.search(stdout)
+        if match is not None:
             try:
-                data = json.loads(json_text)
+                data = _loads(stdout[match.end() - 1:])
                 return data, elapsed, None
             except json.JSONDecodeError:
                 pass
         return None, elapsed, "JSON parse error"
 
 
+def engine_supports(*words):
+    """Probe the engine's --help output for a subcommand or option.
+
+    engine_supports("batch") looks for the subcommand in `polaris --help`;
+    engine_supports("batch", "--socket") looks for the option in
+    `polaris batch --help`. Older builds simply do not list them.
+    """
+    *prefix, name = words
+    try:
+        result = subprocess.run(
+            [str(POLARIS_BIN), *prefix, "--help"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    needle = name.encode()
+    return any(line.split()[:1] == [needle] for line in result.stdout.splitlines())
+
+
+def batch_works():
+    """Run one offline coordinate job through `polaris batch` as a smoke test.
+
+    Listing the subcommand in --help is not enough to route whole sweeps
+    through it, so require a real result line first.
+    """
+    job = {"lat": 21.4225, "lon": 39.8262, "tz": "Asia/Riyadh", "date": EXTREME_DATES[0]}
+    try:
+        result = subprocess.run(
+            [str(POLARIS_BIN), "batch", "--offline"],
+            input=json.dumps(job).encode() + b"\n",
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10,
+        )
+        data = _loads(result.stdout)
+    except (OSError, subprocess.TimeoutExpired, json.JSONDecodeError):
+        return False
+    return result.returncode == 0 and "events" in data
+
+
+def run_polaris_batch(jobs, job_timeout=30):
+    """Run jobs through one `polaris batch` process.
+
+    Each job is a dict like {"city": ..., "date": ..., "strategy": ...}.
+    Yields (data, elapsed, error) per job, in order; elapsed is the time
+    since the previous result arrived. Like the 30 s per-city subprocess
+    timeout, the process is killed if any one result takes longer than
+    `job_timeout`; the unanswered jobs are then reported as errors.
+    """
+    proc = subprocess.Popen(
+        [str(POLARIS_BIN), "batch"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+
+    # Feed stdin from a thread so a full stdout pipe can never deadlock us.
+    # If the engine dies mid-stream the write fails; the missing results
+    # are reported below as "exited early", so the error is dropped here.
+    def feed():
+        try:
+            for job in jobs:
+                proc.stdin.write(json.dumps(job).encode() + b"\n")
+        except OSError:
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    threading.Thread(target=feed, daemon=True).start()
+
+    timed_out = threading.Event()
+
+    def expire():
+        timed_out.set()
+        proc.kill()
+
+    def arm():
+        timer = threading.Timer(job_timeout, expire)
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    watchdog = arm()
+    t0 = time.monotonic()
+    received = 0
+    try:
+        for line in proc.stdout:
+            watchdog.cancel()
+            watchdog = arm()
+            now = time.monotonic()
+            elapsed, t0 = now - t0, now
+            received += 1
+            try:
+                data = _loads(line)
+            except json.JSONDecodeError:
+                yield None, elapsed, "JSON parse error"
+                continue
+            if "error" in data:
+                yield None, elapsed, data["error"]
+            else:
+                yield data, elapsed, None
+    finally:
+        watchdog.cancel()
+        proc.stdout.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    if timed_out.is_set():
+        reason = f"Batch process timed out ({job_timeout}s without a result)"
+    else:
+        reason = f"Batch process exited early (code {proc.returncode})"
+    for _ in range(received, len(jobs)):
+        yield None, 0.0, reason
+
+
+def _pin_worker():
+    # sched_setaffinity(0, ...) applies to the calling thread on Linux.
+    if not PIN_WORKERS or not hasattr(os, "sched_setaffinity"):
+        return
+    cores = sorted(os.sched_getaffinity(0))
+    try:
+        os.sched_setaffinity(0, {cores[next(_worker_ids) % len(cores)]})
+    except OSError:
+        pass
+
+
+def worker_pool():
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, initializer=_pin_worker)
+
+
+def _daemon_start():
+    proc = subprocess.Popen(
+        [str(POLARIS_BIN), "batch", "--socket", str(DAEMON_SOCKET)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    atexit.register(_daemon_stop, proc)
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.connect(str(DAEMON_SOCKET))
+            return True
+        except OSError:
+            time.sleep(0.02)
+    return False
+
+
+def _daemon_stop(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+    try:
+        DAEMON_SOCKET.unlink()
+    except OSError:
+        pass
+
+
+def daemon_available():
+    """Spawn the socket daemon on first use; False if unsupported or it failed.
+
+    main() makes the first call from the unpinned main thread, so the
+    daemon does not inherit a pool worker's single-core affinity.
+    """
+    global _daemon_ok
+    if not USE_DAEMON:
+        return False
+    with _daemon_lock:
+        if _daemon_ok is None:
+            _daemon_ok = _daemon_start()
+        return _daemon_ok
+
+
+def query_daemon(job, timeout=30):
+    """Send one job over this thread's daemon connection -> (data, elapsed, error).
+
+    `timeout` bounds the whole exchange like the per-call subprocess
+    timeouts; on expiry the connection is dropped and reopened next time.
+    """
+    t0 = time.monotonic()
+    conn = getattr(_daemon_local, "conn", None)
+    try:
+        if conn is None:
+            s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn = _daemon_local.conn = (s, s.makefile("rb"))
+            s.settimeout(timeout)
+            s.connect(str(DAEMON_SOCKET))
+        s, reader = conn
+        s.settimeout(timeout)
+        s.sendall((json.dumps(job) + "\n").encode())
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("daemon closed the connection")
+    except OSError as e:
+        # A timed-out reply may still arrive later, so never reuse the socket.
+        _daemon_local.conn = None
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+        return None, time.monotonic() - t0, f"Daemon error: {e}"
+    elapsed = time.monotonic() - t0
+
+    try:
+        data = _loads(line)
+    except json.JSONDecodeError:
+        return None, elapsed, "JSON parse error"
+    if "error" in data:
+        return None, elapsed, data["error"]
+    return data, elapsed, None
+
+
+@functools.lru_cache(maxsize=256)
+def _zone(tz_name):
+    return ZoneInfo(tz_name)
+
+
+@functools.lru_cache(maxsize=256)
+def _local_date_at(tz_name, minute):
+    # Local dates only change on whole-minute boundaries, so the date at
+    # the start of a minute holds for all of it.
+    return datetime.fromtimestamp(minute * 60, _zone(tz_name)).strftime("%Y-%m-%d")
+
+
 def get_local_date(tz_name):
     try:
-        tz = ZoneInfo(tz_name)
-        return datetime.now(tz).strftime("%Y-%m-%d")
+        return _local_date_at(tz_name, int(time.time() // 60))
     except Exception:
         return TODAY_MACHINE
 
@@ -321,11 +717,58 @@ def get_local_date(tz_name):
 # Verification engine
 # ──────────────────────────────────────────────────────────────
 
+ALL_PRAYERS = ("fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha")
+ORDERED_PRAYERS = ("dhuhr", "asr", "maghrib", "isha")
+_ORDER_SLOT = {p: i for i, p in enumerate(ORDERED_PRAYERS)}
+
+# Confidence the engine assigns to each event method.
+METHOD_CONFIDENCE = {"Standard": 1.0, "Virtual": 0.7, "Projected": 0.5}
+FUZZ_METHOD_CONFIDENCE = {**METHOD_CONFIDENCE, "None": 0.0}
+
+# Basic sanity: SA → Asia/*, US → America/*, etc.
+TZ_EXPECTED_CONTINENTS = {
+    "SA": frozenset({"Asia"}), "AE": frozenset({"Asia"}), "QA": frozenset({"Asia"}),
+    "US": frozenset({"America", "Pacific"}), "CA": frozenset({"America"}),
+    "GB": frozenset({"Europe"}), "FR": frozenset({"Europe"}), "DE": frozenset({"Europe"}),
+    "AU": frozenset({"Australia"}), "JP": frozenset({"Asia"}), "CN": frozenset({"Asia"}),
+}
+
 def time_to_minutes(t_str):
     if not t_str:
         return None
-    parts = t_str.split(":")
-    return int(parts[0]) * 60 + int(parts[1]) + int(parts[2]) / 60
+    # The engine always emits zero-padded "HH:MM:SS", so read the digits
+    # by position instead of split() + three int() calls.
+    b = t_str.encode("ascii")
+    return ((b[0] - 48) * 600 + (b[1] - 48) * 60 + (b[3] - 48) * 10 + (b[4] - 48)
+            + ((b[6] - 48) * 10 + (b[7] - 48)) / 60)
+
+
+@njit(cache=True)
+def normalize_order(d, a, m, i, d_nd, a_nd, m_nd, i_nd):
+    """Put Dhuhr/Asr/Maghrib/Isha minutes on one increasing timeline.
+
+    Applies the engine's next_day flags, then the implicit wrap-around:
+    if a later prayer has a smaller minute value than the one before it,
+    it likely crossed midnight — the engine may not always set next_day
+    for Virtual/Projected times. Returns (d, a, m, i, ordered).
+    """
+    if d_nd:
+        d += 1440
+    if a_nd:
+        a += 1440
+    if m_nd:
+        m += 1440
+    if i_nd:
+        i += 1440
+
+    if a < d:
+        a += 1440
+    if m < a:
+        m += 1440
+    if i < m:
+        i += 1440
+
+    return d, a, m, i, (d < a and a < m and m < i)
 
 
 def verify_city(data, strategy="projected45"):
@@ -349,10 +792,10 @@ def verify_city(data, strategy="projected45"):
             return "FAIL", f"Maghrib method is None under Projected45"
 
     # Confidence consistency
-    expected_conf = {"Standard": 1.0, "Virtual": 0.7, "Projected": 0.5}
-    if m_method in expected_conf and m_conf is not None:
-        if abs(m_conf - expected_conf[m_method]) > 0.01:
-            return "FAIL", f"Confidence mismatch: {m_method}={m_conf}, expected {expected_conf[m_method]}"
+    expected_conf = METHOD_CONFIDENCE.get(m_method)
+    if expected_conf is not None and m_conf is not None:
+        if abs(m_conf - expected_conf) > 0.01:
+            return "FAIL", f"Confidence mismatch: {m_method}={m_conf}, expected {expected_conf}"
 
     # ── Rule 2: Ordering invariants ──
     d_min = time_to_minutes(dhuhr.get("time"))
@@ -361,22 +804,11 @@ def verify_city(data, strategy="projected45"):
     i_min = time_to_minutes(isha.get("time"))
 
     if all(v is not None for v in [d_min, a_min, m_min, i_min]):
-        if m_next_day:
-            m_min += 1440
-        if isha.get("next_day", False):
-            i_min += 1440
-        if asr.get("next_day", False):
-            a_min += 1440
-
-        # Handle implicit wrap-around: if a later prayer has a smaller
-        # minute value than the one before it, it likely crossed midnight.
-        # The engine may not always set next_day for Virtual/Projected times.
-        if a_min < d_min:
-            a_min += 1440
-        if m_min < a_min:
-            m_min += 1440
-        if i_min < m_min:
-            i_min += 1440
+        # Dhuhr's own next_day flag is not applied here (local-time runs).
+        d_min, a_min, m_min, i_min, _ = normalize_order(
+            d_min, a_min, m_min, i_min,
+            False, bool(asr.get("next_day", False)), bool(m_next_day), bool(isha.get("next_day", False)),
+        )
 
         if not (d_min < a_min):
             return "FAIL", f"Ordering: Dhuhr({d_min:.0f}) >= Asr({a_min:.0f})"
@@ -408,17 +840,10 @@ def verify_city(data, strategy="projected45"):
     cc = loc.get("country_code", "")
     tz = loc.get("timezone", "")
     if cc and tz:
-        # Basic sanity: SA → Asia/*, US → America/*, etc.
         tz_continent = tz.split("/")[0] if "/" in tz else ""
-        tz_mismatches = {
-            "SA": ["Asia"], "AE": ["Asia"], "QA": ["Asia"],
-            "US": ["America", "Pacific"], "CA": ["America"],
-            "GB": ["Europe"], "FR": ["Europe"], "DE": ["Europe"],
-            "AU": ["Australia"], "JP": ["Asia"], "CN": ["Asia"],
-        }
-        if cc in tz_mismatches:
-            if tz_continent not in tz_mismatches[cc]:
-                return "WARN", f"TZ mismatch: {cc} expected {tz_mismatches[cc]} but got {tz}"
+        expected = TZ_EXPECTED_CONTINENTS.get(cc)
+        if expected and tz_continent not in expected:
+            return "WARN", f"TZ mismatch: {cc} expected {sorted(expected)} but got {tz}"
 
     # ── Rule 6: Extreme next_day in low latitudes ──
     lat = loc.get("latitude", 0)
@@ -447,18 +872,75 @@ def verify_strict(data):
         return "WARN", f"Strict: {m_method} Maghrib in Normal state"
 
 
+def verify_fuzz(data, lat):
+    """Invariant checks for one fuzz result (UTC timezone, projected45).
+
+    Walks the six events once, checking NaN/Inf and method/confidence
+    agreement while collecting the four ordering prayers. Failures keep
+    the original precedence: NaN/Inf, then missing Maghrib, then the
+    first confidence mismatch.
+    """
+    events = data.get("events", {})
+    vals = [None] * len(ORDERED_PRAYERS)
+    flags = [False] * len(ORDERED_PRAYERS)
+    mismatch = None
+
+    for prayer_name in ALL_PRAYERS:
+        ev = events.get(prayer_name, {})
+        conf = ev.get("confidence")
+        if conf is not None and (math.isnan(conf) or math.isinf(conf)):
+            return "FAIL", f"NaN/Inf confidence in {prayer_name}"
+        expected = FUZZ_METHOD_CONFIDENCE.get(ev.get("method"))
+        if mismatch is None and expected is not None and conf is not None and abs(conf - expected) > 0.01:
+            mismatch = prayer_name
+        slot = _ORDER_SLOT.get(prayer_name)
+        if slot is not None:
+            vals[slot] = time_to_minutes(ev.get("time"))
+            flags[slot] = bool(ev.get("next_day", False))
+
+    if events.get("maghrib", {}).get("time") is None:
+        return "FAIL", "Maghrib None under projected45"
+    if mismatch is not None:
+        return "FAIL", f"{mismatch} conf mismatch"
+
+    # Ordering (Dhuhr < Asr < Maghrib < Isha). next_day applies to ALL
+    # prayers — in UTC, far from Greenwich, any of them can wrap past
+    # midnight, and dhuhr itself can be near midnight.
+    if all(v is not None for v in vals):
+        d, a, m, isha_v, ordered = normalize_order(*vals, *flags)
+        if not ordered:
+            # At extreme latitudes (|lat|>70), Projected45 can produce
+            # ordering anomalies — downgrade to WARN, not FAIL.
+            if abs(lat) > 70:
+                return "WARN", "ordering violation at extreme latitude (expected for Projected45)"
+            return "FAIL", f"ordering violation D={d:.0f} A={a:.0f} M={m:.0f} I={isha_v:.0f}"
+
+    return "PASS", "All checks passed"
+
+
 # ──────────────────────────────────────────────────────────────
 # Fuzz tests (deterministic lat/lon)
 # ──────────────────────────────────────────────────────────────
 
-def run_fuzz_tests(n=20, date="2026-02-14"):
+def run_fuzz_tests(n=20, date="2026-02-14", rng=None):
     """Generate random lat/lon pairs and verify invariants."""
-    rng = random.Random(42)
+    rng = FUZZ_RNG if rng is None else rng
     results = {"pass": 0, "warn": 0, "fail": 0}
 
-    for i in range(n):
-        lat = rng.uniform(-89.9, 89.9)
-        lon = rng.uniform(-179.9, 179.9)
+    # Draw all coordinates up front in two vectorized calls, so the
+    # sequence stays deterministic regardless of worker completion order.
+    lats = rng.uniform(-89.9, 89.9, n)
+    lons = rng.uniform(-179.9, 179.9, n)
+    coords = list(zip(lats.tolist(), lons.tolist()))
+
+    def run_one(coord):
+        lat, lon = coord
+        if daemon_available():
+            data, _, err = query_daemon({
+                "lat": round(lat, 4), "lon": round(lon, 4), "tz": "UTC",
+                "date": date, "strategy": "projected45",
+            }, timeout=15)
+            return data, err
         cmd = [
             str(POLARIS_BIN),
             "--lat", f"{lat:.4f}",
@@ -468,81 +950,30 @@ def run_fuzz_tests(n=20, date="2026-02-14"):
             "--strategy", "projected45",
         ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=15)
             if result.returncode != 0:
-                results["fail"] += 1
-                print(f"    FAIL: lat={lat:.2f} lon={lon:.2f} — exit code {result.returncode}")
-                continue
+                return None, f"exit code {result.returncode}"
+            return _loads(result.stdout), None
+        except Exception as e:
+            return None, f"exception: {e}"
 
-            data = json.loads(result.stdout.strip())
-            events = data.get("events", {})
-
-            # Check: no NaN values
-            for prayer_name in ["fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha"]:
-                ev = events.get(prayer_name, {})
-                conf = ev.get("confidence")
-                if conf is not None and (math.isnan(conf) or math.isinf(conf)):
-                    results["fail"] += 1
-                    print(f"    FAIL: lat={lat:.2f} lon={lon:.2f} — NaN/Inf confidence in {prayer_name}")
-                    continue
-
-            # Check: Maghrib must not be None under projected45
-            maghrib = events.get("maghrib", {})
-            if maghrib.get("time") is None:
-                results["fail"] += 1
-                print(f"    FAIL: lat={lat:.2f} lon={lon:.2f} — Maghrib None under projected45")
-                continue
+    with worker_pool() as pool:
+        outcomes = list(pool.map(run_one, coords))
 
-            # Check: confidence matches method
-            for prayer_name in ["fajr", "sunrise", "dhuhr", "asr", "maghrib", "isha"]:
-                ev = events.get(prayer_name, {})
-                method = ev.get("method")
-                conf = ev.get("confidence")
-                expected = {"Standard": 1.0, "Virtual": 0.7, "Projected": 0.5, "None": 0.0}
-                if method in expected and conf is not None:
-                    if abs(conf - expected[method]) > 0.01:
-                        results["fail"] += 1
-                        print(f"    FAIL: lat={lat:.2f} lon={lon:.2f} — {prayer_name} conf mismatch")
-                        break
-
-            # Check: ordering (Dhuhr < Asr < Maghrib < Isha)
-            # Account for next_day flags on ALL prayers — when using UTC for
-            # locations far from Greenwich, any prayer can wrap past midnight.
-            prayers_ordered = ["dhuhr", "asr", "maghrib", "isha"]
-            vals = []
-            for pn in prayers_ordered:
-                ev = events.get(pn, {})
-                v = time_to_minutes(ev.get("time"))
-                if v is not None and ev.get("next_day", False):
-                    v += 1440
-                vals.append(v)
-            d, a, m, isha_v = vals
-            if all(v is not None for v in [d, a, m, isha_v]):
-                # For extreme UTC offsets, dhuhr itself can be near midnight.
-                # Normalize: if asr < dhuhr, it wrapped — shift asr, maghrib, isha.
-                if a < d:
-                    a += 1440
-                if m < a:
-                    m += 1440
-                if isha_v < m:
-                    isha_v += 1440
-                if not (d < a < m < isha_v):
-                    # At extreme latitudes (|lat|>70), Projected45 can produce
-                    # ordering anomalies — downgrade to WARN, not FAIL.
-                    if abs(lat) > 70:
-                        results["warn"] += 1
-                        print(f"    WARN: lat={lat:.2f} lon={lon:.2f} — ordering violation at extreme latitude (expected for Projected45)")
-                    else:
-                        results["fail"] += 1
-                        print(f"    FAIL: lat={lat:.2f} lon={lon:.2f} — ordering violation D={d:.0f} A={a:.0f} M={m:.0f} I={isha_v:.0f}")
-                    continue
-
-            results["pass"] += 1
+    for (lat, lon), (data, err) in zip(coords, outcomes):
+        if err is not None:
+            verdict, reason = "FAIL", err
+        else:
+            try:
+                verdict, reason = verify_fuzz(data, lat)
+            except Exception as e:
+                verdict, reason = "FAIL", f"exception: {e}"
 
-        except Exception as e:
-            results["fail"] += 1
-            print(f"    FAIL: lat={lat:.2f} lon={lon:.2f} — exception: {e}")
+        results[verdict.lower()] += 1
+        if verdict != "PASS":
+            log(f"    {verdict}: lat={lat:.2f} lon={lon:.2f} — {reason}")
 
+    sys.stdout.flush()
     return results
 
 
@@ -550,22 +981,79 @@ def run_fuzz_tests(n=20, date="2026-02-14"):
 # Run a date sweep for 30 cities
 # ──────────────────────────────────────────────────────────────
 
+def warm_cache(cities):
+    """Resolve every city once, serially, before any parallel sweep.
+
+    Polaris keeps its own geocoding cache (~/.polaris/cache.json); warming
+    it up front means the timed sweeps never wait on Nominatim, and no two
+    workers race to write the cache file. The warm-up output is discarded,
+    so TODAY's sweep is still a real, timed run (reporting source=Cache).
+    Cities whose TODAY result is already in the result cache are skipped,
+    since no sweep will call the engine for them.
+    Returns (warmed, nominatim_hits, errors).
+    """
+    warmed = nominatim_hits = errors = 0
+    for city_name, _, _ in cities:
+        if cache_load(city_name, TODAY_MACHINE, "projected45") is not None:
+            continue
+        warmed += 1
+        # Bypass the result cache: we want a live run to report its source.
+        data, _, err = run_polaris.__wrapped__(city_name, date=TODAY_MACHINE, strategy="projected45")
+        if err or data is None:
+            errors += 1
+            continue
+        if data.get("location", {}).get("source") == "Nominatim":
+            nominatim_hits += 1
+    return warmed, nominatim_hits, errors
+
+
+def sweep_batch(cities, date, strategy):
+    """Compute a sweep with one `polaris batch` call for all cache misses."""
+    outcomes = [None] * len(cities)
+    misses = []
+    for i, (city_name, _, _) in enumerate(cities):
+        cached = cache_load(city_name, date, strategy)
+        if cached is not None:
+            outcomes[i] = (cached, 0.0, None)
+        else:
+            misses.append(i)
+
+    if not misses:
+        return outcomes
+
+    jobs = [{"city": cities[i][0], "date": date, "strategy": strategy} for i in misses]
+    for (data, elapsed, err), i in zip(run_polaris_batch(jobs), misses):
+        if err is None:
+            cache_store(cities[i][0], date, strategy, data)
+        outcomes[i] = (data, elapsed, err)
+    return outcomes
+
+
 def run_date_sweep(cities, date, strategy="projected45", label=""):
     results = []
     total_start = time.monotonic()
     cache_hits = 0
     nominatim_hits = 0
 
-    for i, (city_name, region, approx_lat) in enumerate(cities, 1):
+    if USE_BATCH and not daemon_available():
+        outcomes = sweep_batch(cities, date, strategy)
+    else:
+        def run_one(city):
+            return run_polaris(city[0], date=date, strategy=strategy)
+
+        # pool.map returns results in input order, so rows print in city order.
+        with worker_pool() as pool:
+            outcomes = list(pool.map(run_one, cities))
+
+    for i, ((city_name, region, approx_lat), (data, elapsed, err)) in enumerate(zip(cities, outcomes), 1):
         tag = f"[{i:2d}/30]"
-        data, elapsed, err = run_polaris(city_name, date=date, strategy=strategy)
         if err or data is None:
             results.append({
                 "city": city_name, "region": region, "approx_lat": approx_lat,
                 "data": None, "elapsed": elapsed, "error": err,
                 "verdict": "FAIL", "reason": f"Polaris error: {err}",
             })
-            print(f"  {tag} ✗ {city_name:20s} — ERROR: {err}")
+            log(f"  {tag} ✗ {city_name:20s} — ERROR: {err}")
             continue
 
         source = data["location"].get("source", "")
@@ -585,7 +1073,7 @@ def run_date_sweep(cities, date, strategy="projected45", label=""):
         tz = data["location"]["timezone"]
 
         icon = {"PASS": "✓", "WARN": "⚠", "FAIL": "✗"}[verdict]
-        print(
+        log(
             f"  {tag} {icon} {city_name:20s} "
             f"| {tz:30s} | {state:12s} "
             f"| {m_str}{m_next:6s} [{m_method:9s} {m_conf}] "
@@ -603,7 +1091,8 @@ def run_date_sweep(cities, date, strategy="projected45", label=""):
     warn_c = sum(1 for r in results if r["verdict"] == "WARN")
     fail_c = sum(1 for r in results if r["verdict"] == "FAIL")
 
-    print(f"\n  {label} [{date}]: PASS={pass_c} WARN={warn_c} FAIL={fail_c} ({total_elapsed:.1f}s, avg {total_elapsed/len(cities):.2f}s)")
+    log(f"\n  {label} [{date}]: PASS={pass_c} WARN={warn_c} FAIL={fail_c} ({total_elapsed:.1f}s, avg {total_elapsed/len(cities):.2f}s)")
+    sys.stdout.flush()
     return results, pass_c, warn_c, fail_c
 
 
@@ -611,15 +1100,42 @@ def run_date_sweep(cities, date, strategy="projected45", label=""):
 # Main
 # ──────────────────────────────────────────────────────────────
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Polaris Chronos global Maghrib stress test.")
+    parser.add_argument(
+        "--no-warm", action="store_true",
+        help="skip the serial geocoding warm-up before the sweeps (for A/B timing)",
+    )
+    parser.add_argument(
+        "--no-pin", action="store_true",
+        help="do not pin worker threads (and the polaris processes they spawn) to CPU cores",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
     print("=" * 72)
     print("  POLARIS CHRONOS — Global Maghrib Stress Test v2")
     print("  (30 cities × 3 dates + strict sanity + fuzz)")
     print("=" * 72)
 
-    ver_result = subprocess.run([str(POLARIS_BIN), "--version"], capture_output=True, text=True)
-    version = ver_result.stdout.strip() if ver_result.returncode == 0 else "unknown"
-    print(f"  Engine:   {version}")
+    ver_result = subprocess.run([str(POLARIS_BIN), "--version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    version = ver_result.stdout.decode("utf-8", "replace").strip() if ver_result.returncode == 0 else "unknown"
+    global ENGINE_ID, USE_BATCH, USE_DAEMON, PIN_WORKERS
+    PIN_WORKERS = not args.no_pin
+    ENGINE_ID = engine_fingerprint()
+    USE_BATCH = engine_supports("batch") and batch_works()
+    USE_DAEMON = USE_BATCH and engine_supports("batch", "--socket")
+    if USE_DAEMON and not daemon_available():
+        USE_DAEMON = False
+    mode = " (daemon mode)" if USE_DAEMON else " (batch mode)" if USE_BATCH else ""
+    print(f"  Engine:   {version}{mode}")
+    if ENGINE_ID is None:
+        print("  Cache:    disabled (could not fingerprint the engine binary)")
+    else:
+        print(f"  Cache:    {RESULT_CACHE_DIR} (engine sha256 {ENGINE_ID[:12]})")
     print(f"  Date:     {TODAY_MACHINE} (machine local)")
     print(f"  Seed:     SHA256({SEED_STRING!r})")
     print(f"  Dates:    today + {', '.join(EXTREME_DATES)}")
@@ -635,6 +1151,13 @@ def main():
     print(f"  Selected: {len(cities)} cities")
     print(f"  Regions:  {dict(sorted(region_counts.items()))}")
     print(f"  Southern: {southern} | Above 55°N: {above_55}")
+    if args.no_warm:
+        print("  Warm-up:  skipped (--no-warm)")
+    else:
+        t0 = time.monotonic()
+        warmed, nominatim_hits, warm_errors = warm_cache(cities)
+        errors = f", {warm_errors} error(s)" if warm_errors else ""
+        print(f"  Warm-up:  {warmed}/{len(cities)} cities, nominatim_hits={nominatim_hits}{errors} ({time.monotonic() - t0:.1f}s)")
     print()
 
     total_fails = 0
@@ -666,8 +1189,7 @@ def main():
     sorted_by_lat = sorted(today_results, key=lambda r: -abs(r["approx_lat"]))
     strict_cities = [sorted_by_lat[0]]
     remaining = [r for r in today_results if r is not sorted_by_lat[0] and r["data"]]
-    rng = random.Random(42)
-    rng.shuffle(remaining)
+    STRICT_RNG.shuffle(remaining)
     for r in remaining:
         if len(strict_cities) >= 5:
             break
@@ -692,11 +1214,12 @@ def main():
 
         icon = {"PASS": "✓", "WARN": "⚠", "FAIL": "✗"}[verdict]
         if data:
-            print(f"  {icon} {city_name:20s} | {state:12s} | Maghrib: {m_time or 'N/A':8s} [{m_method}] — {reason}")
+            log(f"  {icon} {city_name:20s} | {state:12s} | Maghrib: {m_time or 'N/A':8s} [{m_method}] — {reason}")
         else:
-            print(f"  {icon} {city_name:20s} — {reason}")
+            log(f"  {icon} {city_name:20s} — {reason}")
 
-    print(f"\n  Strict: PASS={strict_pass} WARN={strict_warn} FAIL={strict_fail}")
+    log(f"\n  Strict: PASS={strict_pass} WARN={strict_warn} FAIL={strict_fail}")
+    sys.stdout.flush()
     total_fails += strict_fail
     total_warns += strict_warn
 
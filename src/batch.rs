@@ -0,0 +1,291 @@
+//! Batch mode: many computations from one process.
+//!
+//! Reads one JSON job per line and writes one JSON result per line, in the
+//! same order. Each result is either a full `SolverOutput` or
+//! `{"error": "..."}`, so a bad job never aborts the rest of the stream.
+//!
+//! The same protocol is served on stdin/stdout (`polaris batch`) or on a
+//! Unix domain socket (`polaris batch --socket PATH`) for long-running use.
+//!
+//! Job fields mirror `GET /api/times`:
+//!   {"city": "Oslo", "date": "2026-06-21", "strategy": "projected45"}
+//!   {"lat": 78.2, "lon": 15.6, "tz": "UTC", "date": "2026-12-21"}
+
+use chrono::{NaiveDate, Utc};
+use chrono_tz::Tz;
+use serde::{Deserialize, Serialize};
+use std::io::{self, BufRead, BufReader, Write};
+use std::path::Path;
+use std::sync::{Arc, Mutex};
+use std::thread;
+
+use crate::location::{LocationResolver, ResolvedLocation, ResolveOptions};
+use crate::schedule::GapStrategy;
+use crate::solver::{Solver, SolverOutput};
+
+/// A single computation request.
+#[derive(Debug, Deserialize)]
+pub struct BatchJob {
+    pub city: Option<String>,
+    pub country: Option<String>,
+    pub lat: Option<f64>,
+    pub lon: Option<f64>,
+    pub tz: Option<String>,
+    pub date: Option<String>,
+    pub strategy: Option<String>,
+}
+
+#[derive(Serialize)]
+struct BatchError {
+    error: String,
+}
+
+fn parse_strategy(s: Option<&str>) -> Result<GapStrategy, String> {
+    match s.map(|s| s.to_lowercase()).as_deref() {
+        Some("strict") => Ok(GapStrategy::Strict),
+        Some("projected45") | Some("projected") | None => Ok(GapStrategy::Projected45),
+        Some(other) => Err(format!("Unknown strategy '{}'. Use 'strict' or 'projected45'.", other)),
+    }
+}
+
+/// Run one job against a shared resolver (so its cache stays warm).
+pub fn run_job(job: &BatchJob, resolver: &mut LocationResolver) -> Result<SolverOutput, String> {
+    let resolved = resolve_job(job, resolver)?;
+    solve_job(job, &resolved)
+}
+
+/// Resolve the job's location, applying any timezone override.
+fn resolve_job(job: &BatchJob, resolver: &mut LocationResolver) -> Result<ResolvedLocation, String> {
+    let resolved = if let Some(ref city) = job.city {
+        let opts = ResolveOptions {
+            country: job.country.clone(),
+            topk: None,
+        };
+        resolver.resolve_city_with_opts(city, &opts).map_err(|e| format!("{}", e))?
+    } else if let (Some(lat), Some(lon)) = (job.lat, job.lon) {
+        if !(-90.0..=90.0).contains(&lat) || !(-180.0..=180.0).contains(&lon) {
+            return Err("Invalid coordinates. Lat: -90..90, Lon: -180..180".into());
+        }
+        LocationResolver::from_manual(lat, lon, job.tz.as_deref())
+    } else {
+        return Err("Provide 'city' or 'lat'+'lon'".into());
+    };
+
+    match &job.tz {
+        Some(tz_str) => {
+            let _: Tz = tz_str.parse().map_err(|_| format!("Unknown timezone '{}'", tz_str))?;
+            Ok(ResolvedLocation {
+                tz: tz_str.clone(),
+                ..resolved
+            })
+        }
+        None => Ok(resolved),
+    }
+}
+
+/// Solve for an already-resolved location. Needs no shared state.
+fn solve_job(job: &BatchJob, resolved: &ResolvedLocation) -> Result<SolverOutput, String> {
+    let date = match &job.date {
+        Some(d) => NaiveDate::parse_from_str(d, "%Y-%m-%d")
+            .map_err(|e| format!("Invalid date '{}': {}", d, e))?,
+        None => Utc::now().naive_utc().date(),
+    };
+
+    let strategy = parse_strategy(job.strategy.as_deref())?;
+
+    let solver = Solver::from_resolved(resolved).with_strategy(strategy);
+    Ok(solver.solve_with_info(date, false, false, Some(resolved)))
+}
+
+fn parse_job(line: &str) -> Result<BatchJob, String> {
+    serde_json::from_str(line).map_err(|e| format!("Invalid job: {}", e))
+}
+
+fn encode_result(result: Result<SolverOutput, String>) -> String {
+    match result {
+        Ok(output) => serde_json::to_string(&output).unwrap(),
+        Err(error) => serde_json::to_string(&BatchError { error }).unwrap(),
+    }
+}
+
+/// Answer a single request line with a single response line (no newline).
+pub fn handle_line(line: &str, resolver: &mut LocationResolver) -> String {
+    encode_result(parse_job(line).and_then(|job| run_job(&job, resolver)))
+}
+
+/// Like `handle_line`, but only holds the resolver lock while resolving,
+/// so concurrent connections solve in parallel. A panic in another
+/// connection's resolve poisons the lock; the resolver (a geocoding cache)
+/// is still usable, so keep serving rather than failing every later job.
+fn handle_line_shared(line: &str, resolver: &Mutex<LocationResolver>) -> String {
+    encode_result(parse_job(line).and_then(|job| {
+        let mut guard = resolver.lock().unwrap_or_else(|e| e.into_inner());
+        let resolved = resolve_job(&job, &mut guard)?;
+        drop(guard);
+        solve_job(&job, &resolved)
+    }))
+}
+
+/// Process newline-delimited jobs until EOF. Blank lines are skipped.
+/// Output is flushed after every line so callers can stream results.
+pub fn serve_lines<R: BufRead, W: Write>(
+    reader: R,
+    mut writer: W,
+    resolver: &mut LocationResolver,
+) -> io::Result<()> {
+    for line in reader.lines() {
+        let line = line?;
+        if line.trim().is_empty() {
+            continue;
+        }
+        writeln!(writer, "{}", handle_line(&line, resolver))?;
+        writer.flush()?;
+    }
+    Ok(())
+}
+
+/// Serve the same line protocol on a Unix domain socket, one thread per
+/// connection, until the process is killed. A stale socket file left by a
+/// previous run is replaced; any other existing file is an error.
+#[cfg(unix)]
+pub fn serve_socket(path: &Path, resolver: LocationResolver) -> io::Result<()> {
+    use std::os::unix::fs::FileTypeExt;
+    use std::os::unix::net::UnixListener;
+
+    if let Ok(meta) = std::fs::symlink_metadata(path) {
+        if !meta.file_type().is_socket() {
+            return Err(io::Error::new(
+                io::ErrorKind::AlreadyExists,
+                format!("{} exists and is not a socket", path.display()),
+            ));
+        }
+        std::fs::remove_file(path)?;
+    }
+
+    let listener = UnixListener::bind(path)?;
+    let resolver = Arc::new(Mutex::new(resolver));
+
+    for stream in listener.incoming() {
+        let stream = match stream {
+            Ok(s) => s,
+            Err(e) => {
+                eprintln!("Error: accept failed: {}", e);
+                continue;
+            }
+        };
+        let resolver = Arc::clone(&resolver);
+        thread::spawn(move || {
+            let mut writer = &stream;
+            for line in BufReader::new(&stream).lines() {
+                let Ok(line) = line else { break };
+                if line.trim().is_empty() {
+                    continue;
+                }
+                if writeln!(writer, "{}", handle_line_shared(&line, &resolver)).is_err() {
+                    break;
+                }
+            }
+        });
+    }
+    Ok(())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::location::cache::LocationCache;
+    use tempfile::TempDir;
+
+    fn offline_resolver() -> (LocationResolver, TempDir) {
+        let dir = TempDir::new().unwrap();
+        let cache = LocationCache::load_from(dir.path().join("cache.json"));
+        let mut resolver = LocationResolver::with_cache(cache);
+        resolver.set_offline(true);
+        (resolver, dir)
+    }
+
+    #[test]
+    fn test_serve_lines_one_result_per_job() {
+        let (mut resolver, _dir) = offline_resolver();
+        let input = concat!(
+            r#"{"lat": 21.4225, "lon": 39.8262, "tz": "Asia/Riyadh", "date": "2026-03-20"}"#, "\n",
+            "\n",
+            r#"{"city": "Mecca", "date": "2026-03-20", "strategy": "strict"}"#, "\n",
+        );
+        let mut out = Vec::new();
+        serve_lines(input.as_bytes(), &mut out, &mut resolver).unwrap();
+
+        let lines: Vec<serde_json::Value> = String::from_utf8(out)
+            .unwrap()
+            .lines()
+            .map(|l| serde_json::from_str(l).unwrap())
+            .collect();
+        assert_eq!(lines.len(), 2);
+        for v in &lines {
+            assert!(v.get("error").is_none(), "unexpected error: {}", v);
+            assert!(v["events"]["maghrib"]["time"].is_string());
+        }
+    }
+
+    #[test]
+    fn test_bad_jobs_report_errors() {
+        let (mut resolver, _dir) = offline_resolver();
+        for line in [
+            "not json",
+            r#"{"date": "2026-03-20"}"#,
+            r#"{"lat": 10.0, "lon": 10.0, "date": "2026-13-40"}"#,
+            r#"{"lat": 10.0, "lon": 10.0, "strategy": "bogus"}"#,
+            r#"{"lat": 10.0, "lon": 10.0, "tz": "Mars/Olympus"}"#,
+        ] {
+            let v: serde_json::Value = serde_json::from_str(&handle_line(line, &mut resolver)).unwrap();
+            assert!(v["error"].is_string(), "expected error for {}", line);
+        }
+    }
+
+    #[test]
+    fn test_shared_resolver_survives_poisoned_lock() {
+        let (resolver, _dir) = offline_resolver();
+        let resolver = Arc::new(Mutex::new(resolver));
+        let poisoner = Arc::clone(&resolver);
+        let _ = thread::spawn(move || {
+            let _guard = poisoner.lock().unwrap();
+            panic!("resolver panicked");
+        })
+        .join();
+        assert!(resolver.is_poisoned());
+
+        let line = r#"{"lat": 21.4225, "lon": 39.8262, "tz": "Asia/Riyadh", "date": "2026-03-20"}"#;
+        let v: serde_json::Value = serde_json::from_str(&handle_line_shared(line, &resolver)).unwrap();
+        assert!(v["events"]["maghrib"]["time"].is_string());
+    }
+
+    #[cfg(unix)]
+    #[test]
+    fn test_serve_socket_round_trip() {
+        use std::os::unix::net::UnixStream;
+        use std::time::Duration;
+
+        let (resolver, dir) = offline_resolver();
+        let path = dir.path().join("polaris.sock");
+        let server_path = path.clone();
+        thread::spawn(move || serve_socket(&server_path, resolver));
+
+        let mut stream = None;
+        for _ in 0..100 {
+            match UnixStream::connect(&path) {
+                Ok(s) => { stream = Some(s); break; }
+                Err(_) => thread::sleep(Duration::from_millis(10)),
+            }
+        }
+        let mut stream = stream.expect("socket server did not start");
+
+        writeln!(stream, r#"{{"city": "Mecca", "date": "2026-03-20"}}"#).unwrap();
+        writeln!(stream, r#"{{"date": "2026-03-20"}}"#).unwrap();
+
+        let mut lines = BufReader::new(stream.try_clone().unwrap()).lines();
+        let ok: serde_json::Value = serde_json::from_str(&lines.next().unwrap().unwrap()).unwrap();
+        assert!(ok["events"]["maghrib"]["time"].is_string());
+        let err: serde_json::Value = serde_json::from_str(&lines.next().unwrap().unwrap()).unwrap();
+        assert!(err["error"].is_string());
+    }
+}
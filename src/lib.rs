@@ -1,3 +1,4 @@
+pub mod batch;
 pub mod hijri;
 pub mod location;
 pub mod lunar;
@@ -1,5 +1,6 @@
 use chrono::{NaiveDate, Utc};
 use chrono_tz::Tz;
+use clap::error::ErrorKind;
 use clap::{Parser, Subcommand};
 use polaris_chronos::location::{LocationResolver, ResolvedLocation, ResolveOptions};
 use polaris_chronos::schedule::GapStrategy;
@@ -14,6 +15,8 @@ use polaris_chronos::solver::{Solver, render_ascii_timeline};
 ///   polaris Stockholm
 ///   polaris compute --city "New York" --date 2026-03-20
 ///   polaris server --port 8080
+///   polaris batch < jobs.ndjson
+///   polaris batch --socket /tmp/polaris.sock
 #[derive(Parser)]
 #[command(name = "polaris", version, about, long_about = None)]
 struct Cli {
@@ -28,6 +31,9 @@ enum Command {
 
     /// Start the web server with embedded dashboard.
     Server(ServerArgs),
+
+    /// Read newline-delimited JSON jobs from stdin, write one JSON result per line.
+    Batch(BatchArgs),
 }
 
 #[derive(Parser)]
@@ -100,6 +106,17 @@ struct ServerArgs {
     host: String,
 }
 
+#[derive(Parser)]
+struct BatchArgs {
+    /// Offline mode: only use cache and built-in data.
+    #[arg(long)]
+    offline: bool,
+
+    /// Serve jobs on this Unix domain socket instead of stdin/stdout.
+    #[arg(long)]
+    socket: Option<std::path::PathBuf>,
+}
+
 fn parse_strategy(s: &str) -> Result<GapStrategy, String> {
     match s.to_lowercase().as_str() {
         "strict" => Ok(GapStrategy::Strict),
@@ -116,11 +133,13 @@ fn main() {
         Ok(cli) => match cli.command {
             Some(Command::Server(args)) => run_server(args),
             Some(Command::Compute(args)) => run_compute(args),
+            Some(Command::Batch(args)) => run_batch(args),
             None => {
                 // No subcommand and no args — show help
                 let _ = Cli::parse(); // will print help and exit
             }
         },
+        Err(e) if !is_compute_fallback(&e) => e.exit(),
         Err(_) => {
             // Backward compat: treat all args as compute args
             // Insert "compute" after the binary name so clap can parse it
@@ -134,11 +153,48 @@ fn main() {
     }
 }
 
+/// Only an unrecognized first word or flag means old-style compute args.
+/// `--help`, `--version` and subcommand errors must be reported as-is,
+/// or `polaris --help` would print the compute help instead.
+fn is_compute_fallback(e: &clap::Error) -> bool {
+    matches!(e.kind(), ErrorKind::InvalidSubcommand | ErrorKind::UnknownArgument)
+}
+
 fn run_server(args: ServerArgs) {
     let rt = tokio::runtime::Runtime::new().unwrap();
     rt.block_on(polaris_chronos::server::start(&args.host, args.port));
 }
 
+fn run_batch(args: BatchArgs) {
+    let mut resolver = LocationResolver::new();
+    if args.offline {
+        resolver.set_offline(true);
+    }
+
+    if let Some(path) = args.socket {
+        #[cfg(unix)]
+        {
+            if let Err(e) = polaris_chronos::batch::serve_socket(&path, resolver) {
+                eprintln!("Error: Cannot serve on {}: {}", path.display(), e);
+                std::process::exit(1);
+            }
+        }
+        #[cfg(not(unix))]
+        {
+            eprintln!("Error: --socket requires a Unix platform ({})", path.display());
+            std::process::exit(1);
+        }
+        return;
+    }
+
+    let stdin = std::io::stdin();
+    let stdout = std::io::stdout();
+    if let Err(e) = polaris_chronos::batch::serve_lines(stdin.lock(), stdout.lock(), &mut resolver) {
+        eprintln!("Error: {}", e);
+        std::process::exit(1);
+    }
+}
+
 fn run_compute(cli: ComputeArgs) {
     // ── Resolve location ────────────────────────────────────────
 
@@ -250,3 +306,52 @@ fn resolve_location(cli: &ComputeArgs, resolver: &mut LocationResolver, opts: &R
     eprintln!("  polaris compute --lat 21.4225 --lon 39.8262 --tz Asia/Riyadh");
     std::process::exit(1);
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use clap::CommandFactory;
+
+    fn parse_err(args: &[&str]) -> clap::Error {
+        match Cli::try_parse_from(args) {
+            Ok(_) => panic!("expected {:?} to stop parsing", args),
+            Err(e) => e,
+        }
+    }
+
+    #[test]
+    fn test_legacy_args_fall_back_to_compute() {
+        for args in [
+            &["polaris", "Stockholm"][..],
+            &["polaris", "--city", "New York"][..],
+            &["polaris", "--lat", "21.4", "--lon", "39.8", "--tz", "Asia/Riyadh"][..],
+        ] {
+            assert!(is_compute_fallback(&parse_err(args)), "{:?}", args);
+        }
+    }
+
+    #[test]
+    fn test_help_and_version_are_not_compute_args() {
+        for args in [
+            &["polaris", "--help"][..],
+            &["polaris", "--version"][..],
+            &["polaris", "batch", "--help"][..],
+        ] {
+            assert!(!is_compute_fallback(&parse_err(args)), "{:?}", args);
+        }
+    }
+
+    #[test]
+    fn test_help_lists_batch_and_socket() {
+        let mut cmd = Cli::command();
+        let help = cmd.render_help().to_string();
+        assert!(help.lines().any(|l| l.split_whitespace().next() == Some("batch")));
+
+        let batch_help = cmd
+            .find_subcommand_mut("batch")
+            .unwrap()
+            .render_help()
+            .to_string();
+        assert!(batch_help.contains("--socket"));
+    }
+}